@@ -1,768 +1,990 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-    sanic_babel
-    ~~~~~~~~~~~~~~
-    Inspired from flask-babel
-
-    Implements i18n/l10n support for Flask applications based on Babel.
-
-    :copyright: (c) 2013 by Armin Ronacher, Daniel Neuhäuser.
-    :license: BSD, see LICENSE for more details.
-"""
-import os
-from contextlib import contextmanager
-from datetime import datetime
-from itertools import repeat
-
-from babel import Locale, dates, numbers, support
-
-try:
-    from pytz.gae import pytz
-except ImportError:
-    from pytz import UTC, timezone
-else:
-    timezone = pytz.timezone
-    UTC = pytz.UTC
-
-from sanic_babel.speaklater import LazyString
-
-__version__ = "0.3.0"
-
-
-def is_immutable(self):
-    raise TypeError(
-        "{!r} objects are immutable\
-        ".format(
-            self.__class__.__name__
-        )
-    )
-
-
-def get_request_container(request):
-    return request.ctx.__dict__ if hasattr(request, "ctx") else request
-
-
-class ImmutableDictMixin:
-
-    """Makes a :class:`dict` immutable.
-
-    .. versionadded:: 0.5
-
-    :private:
-    """
-
-    _hash_cache = None
-
-    @classmethod
-    def fromkeys(cls, keys, value=None):
-        instance = super(cls, cls).__new__(cls)
-        instance.__init__(zip(keys, repeat(value)))
-        return instance
-
-    def __reduce_ex__(self, protocol):
-        return type(self), (dict(self),)
-
-    def _iter_hashitems(self):
-        return iter(self)
-
-    def __hash__(self):
-        if self._hash_cache is not None:
-            return self._hash_cache
-
-        rv = self._hash_cache = hash(frozenset(self._iter_hashitems()))
-        return rv
-
-    def setdefault(self, key, default=None):
-        is_immutable(self)
-
-    def update(self, *args, **kwargs):
-        is_immutable(self)
-
-    def pop(self, key, default=None):
-        is_immutable(self)
-
-    def popitem(self):
-        is_immutable(self)
-
-    def __setitem__(self, key, value):
-        is_immutable(self)
-
-    def __delitem__(self, key):
-        is_immutable(self)
-
-    def clear(self):
-        is_immutable(self)
-
-
-class ImmutableDict(ImmutableDictMixin, dict):
-
-    """An immutable :class:`dict`.
-
-    .. versionadded:: 0.5
-    """
-
-    def __repr__(self):
-        return "{}({})".format(self.__class__.__name__, dict.__repr__(self),)
-
-    def copy(self):
-        """Return a shallow mutable copy of this object.  Keep in mind that
-        the standard library's :func:`copy` function is a no-op for this class
-        like for any other python immutable type (eg: :class:`tuple`).
-        """
-        return dict(self)
-
-    def __copy__(self):
-        return self
-
-
-class Babel:
-    """Central controller class that can be used to configure how
-    sanic-babel behaves.  Each application that wants to use sanic-babel
-    has to create, or run :meth:`init_app` on, an instance of this class
-    after the configuration was initialized.
-    """
-
-    default_date_formats = ImmutableDict(
-        {
-            "time": "medium",
-            "date": "medium",
-            "datetime": "medium",
-            "time.short": None,
-            "time.medium": None,
-            "time.full": None,
-            "time.long": None,
-            "date.short": None,
-            "date.medium": None,
-            "date.full": None,
-            "date.long": None,
-            "datetime.short": None,
-            "datetime.medium": None,
-            "datetime.full": None,
-            "datetime.long": None,
-        }
-    )
-
-    def __init__(
-        self,
-        app=None,
-        default_locale="en",
-        default_timezone="UTC",
-        date_formats=None,
-        configure_jinja=True,
-    ):
-        self._default_locale = default_locale
-        self._default_timezone = default_timezone
-        self._date_formats = date_formats
-        self._configure_jinja = configure_jinja
-        self.app = app
-        self.locale_selector_func = None
-        self.timezone_selector_func = None
-
-        if app is not None:
-            self.init_app(app)
-
-    def init_app(self, app):
-        """Set up this instance for use with *app*, if no app was passed to
-        the constructor.
-        """
-        self.app = app
-        app.ctx.babel_instance = self
-        if not hasattr(app.ctx, "extensions"):
-            app.ctx.extensions = {}
-
-        app.ctx.extensions["babel"] = self
-        app.ctx.babel_translations = {}  # cache translations per locale?
-
-        app.config.setdefault("BABEL_DEFAULT_LOCALE", self._default_locale)
-        app.config.setdefault("BABEL_DEFAULT_TIMEZONE", self._default_timezone)
-        if self._date_formats is None:
-            self._date_formats = self.default_date_formats.copy()
-
-        #: a mapping of Babel datetime format strings that can be modified
-        #: to change the defaults.  If you invoke :func:`format_datetime`
-        #: and do not provide any format string sanic-babel will do the
-        #: following things:
-        #:
-        #: 1.   look up ``date_formats['datetime']``.  By default ``'medium'``
-        #:      is returned to enforce medium length datetime formats.
-        #: 2.   ``date_formats['datetime.medium'] (if ``'medium'`` was
-        #:      returned in step one) is looked up.  If the return value
-        #:      is anything but `None` this is used as new format string.
-        #:      otherwise the default for that language is used.
-        self.date_formats = self._date_formats
-
-        if self._configure_jinja:
-            if not hasattr(app.ctx, "jinja_env"):
-                raise ValueError("app.ctx.jinja_env shoud be setup at first.")
-
-            app.ctx.jinja_env.filters.update(
-                datetimeformat=format_datetime,
-                dateformat=format_date,
-                timeformat=format_time,
-                timedeltaformat=format_timedelta,
-                numberformat=format_number,
-                decimalformat=format_decimal,
-                currencyformat=format_currency,
-                percentformat=format_percent,
-                scientificformat=format_scientific,
-            )
-            app.ctx.jinja_env.add_extension("jinja2.ext.i18n")
-            app.ctx.jinja_env.newstyle_gettext = True
-            # reference for update context in jinja_env
-            self._get_translations = get_translations
-
-    def localeselector(self, f):
-        """Registers a callback function for locale selection.  The default
-        behaves as if a function was registered that returns `None` all the
-        time.  If `None` is returned, the locale falls back to the one from
-        the configuration.
-
-        This has to return the locale as string (eg: ``'de_AT'``, ''`en_US`'')
-        """
-        assert (
-            self.locale_selector_func is None
-        ), "a localeselector function is already registered"
-        self.locale_selector_func = f
-        return f
-
-    def timezoneselector(self, f):
-        """Registers a callback function for timezone selection.  The default
-        behaves as if a function was registered that returns `None` all the
-        time.  If `None` is returned, the timezone falls back to the one from
-        the configuration.
-
-        This has to return the timezone as string (eg: ``'Europe/Vienna'``)
-        """
-        assert (
-            self.timezone_selector_func is None
-        ), "a timezoneselector function is already registered"
-        self.timezone_selector_func = f
-        return f
-
-    def list_translations(self):
-        """Returns a list of all the locales translations exist for.  The
-        list returned will be filled with actual locale objects and not just
-        strings.
-        """
-        result = []
-
-        for dirname in self.translation_directories:
-            if not os.path.isdir(dirname):
-                continue
-
-            for folder in os.listdir(dirname):
-                locale_dir = os.path.join(dirname, folder, "LC_MESSAGES")
-                if not os.path.isdir(locale_dir):
-                    continue
-
-                if filter(lambda x: x.endswith(".mo"), os.listdir(locale_dir)):
-                    result.append(Locale.parse(folder))
-
-        # If not other translations are found, add the default locale.
-        if not result:
-            result.append(Locale.parse(self._default_locale))
-
-        return result
-
-    @property
-    def default_locale(self):
-        """The default locale from the configuration as instance of a
-        `babel.Locale` object.
-        """
-        return Locale.parse(self.app.config["BABEL_DEFAULT_LOCALE"])
-
-    @property
-    def default_timezone(self):
-        """The default timezone from the configuration as instance of a
-        `pytz.timezone` object.
-        """
-        return timezone(self.app.config["BABEL_DEFAULT_TIMEZONE"])
-
-    @property
-    def translation_directories(self):
-        directories = self.app.config.get(
-            "BABEL_TRANSLATION_DIRECTORIES", "translations"
-        ).split(";")
-
-        root_path = getattr(self.app, "root_path", None)
-        for path in directories:
-            if not os.path.isabs(path) and root_path is not None:
-                path = os.path.join(root_path, path)
-
-            yield path
-
-
-def get_translations(request=None):
-    """Returns the correct gettext translations that should be used for
-    this request.  This will never fail and return a dummy translation
-    object if used outside of the request or if a translation cannot be
-    found.
-    """
-    if request is None:
-        return support.NullTranslations()
-
-    request_ = get_request_container(request)
-    translations = request_.get("babel_translations", None)
-    if translations is None:
-        app = request.app
-        locale = get_locale(request)
-        if locale in app.ctx.babel_translations:
-            request_["babel_translations"] = app.ctx.babel_translations[locale]
-            return app.ctx.babel_translations[locale]
-
-        translations = support.Translations()
-        babel = app.ctx.babel_instance
-        for dirname in babel.translation_directories:
-            catalog = support.Translations.load(dirname, [locale])
-            translations.merge(catalog)
-            # FIXME: Workaround for merge() being really, really stupid. It
-            # does not copy _info, plural(), or any other instance variables
-            # populated by GNUTranslations. We probably want to stop using
-            # `support.Translations.merge` entirely.
-            if hasattr(catalog, "plural"):
-                translations.plural = catalog.plural
-
-        request_["babel_translations"] = translations
-        app.ctx.babel_translations[locale] = translations
-
-    return translations
-
-
-def get_locale(request=None):
-    """Returns the locale that should be used for this request as
-    `babel.Locale` object.  This returns `Locale.parse('en')` if used outside
-    of a request.
-    """
-    if request is None:
-        return Locale.parse("en")
-
-    request_ = get_request_container(request)
-    locale = request_.get("babel_locale", None)
-    if locale is None:
-        babel = request.app.ctx.babel_instance
-        if babel.locale_selector_func is None:
-            locale = babel.default_locale
-        else:
-            rv = babel.locale_selector_func(request)
-            if rv is None:
-                locale = babel.default_locale
-            else:
-                locale = Locale.parse(rv)
-
-        request_["babel_locale"] = locale
-
-    return locale
-
-
-def get_timezone(request=None):
-    """Returns the timezone that should be used for this request as
-    `pytz.timezone` object.  This returns `UTC` if used outside of
-    a request.
-    """
-    if request is None:
-        return UTC
-
-    request_ = get_request_container(request)
-    tzinfo = request_.get("babel_tzinfo")
-    if tzinfo is None:
-        babel = request.app.ctx.babel_instance
-        if babel.timezone_selector_func is None:
-            tzinfo = babel.default_timezone
-        else:
-            rv = babel.timezone_selector_func(request)
-            if rv is None:
-                tzinfo = babel.default_timezone
-            else:
-                if isinstance(rv, str):
-                    tzinfo = timezone(rv)
-                else:
-                    tzinfo = rv
-
-        request_["babel_tzinfo"] = tzinfo
-
-    return tzinfo
-
-
-def refresh(request=None):
-    """Refreshes the cached timezones and locale information.  This can
-    be used to switch a translation between a request and if you want
-    the changes to take place immediately, not just with the next request::
-
-        user.timezone = request.form['timezone']
-        user.locale = request.form['locale']
-        refresh(request)
-        jinja.flash(gettext('Language was changed', request))
-
-    NOTICE: :func:`jinja.flash` function is from `sanic-jinja2` package.
-
-    Without that refresh, the :func:`jinja.flash` function would probably
-    return English text and a now German page.
-    """
-    if request is None:
-        return
-
-    request_ = get_request_container(request)
-    for key in "babel_locale", "babel_tzinfo", "babel_translations":
-        if key in request_:
-            request_.pop(key)
-
-
-@contextmanager
-def force_locale(locale, request=None):
-    """Temporarily overrides the currently selected locale.
-
-    Sometimes it is useful to switch the current locale to different one, do
-    some tasks and then revert back to the original one. For example, if the
-    user uses German on the web site, but you want to send them an email in
-    English, you can use this function as a context manager::
-
-        with force_locale('en_US', request):
-            send_email(gettext('Hello!', request), ...)
-
-    :param locale: The locale to temporary switch to (ex: 'en_US').
-    :param request: the current Request object
-    """
-    if request is None:
-        yield
-        return
-
-    babel = request.app.ctx.babel_instance
-    request_ = get_request_container(request)
-    orig_locale_selector_func = babel.locale_selector_func
-    orig_attrs = {}
-    for key in ("babel_translations", "babel_locale"):
-        orig_attrs[key] = request_.get(key, None)
-
-    try:
-        babel.locale_selector_func = lambda request: locale
-        for key in orig_attrs:
-            request_[key] = None
-        yield
-    finally:
-        babel.locale_selector_func = orig_locale_selector_func
-        for key, value in orig_attrs.items():
-            request_[key] = value
-
-
-def _get_format(key, format, request):
-    """A small helper for the datetime formatting functions.  Looks up
-    format defaults for different kinds.
-    """
-    if request is None:
-        formats = Babel.default_date_formats.copy()
-    else:
-        formats = request.app.ctx.extensions["babel"].date_formats
-
-    if format is None:
-        format = formats[key]
-
-    if format in ("short", "medium", "full", "long"):
-        rv = formats["{}.{}".format(key, format)]
-        if rv is not None:
-            format = rv
-
-    return format
-
-
-def to_user_timezone(datetime, request=None):
-    """Convert a datetime object to the user's timezone.  This automatically
-    happens on all date formatting unless rebasing is disabled.  If you need
-    to convert a :class:`datetime.datetime` object at any time to the user's
-    timezone (as returned by :func:`get_timezone` this function can be used).
-    """
-    if datetime.tzinfo is None:
-        datetime = datetime.replace(tzinfo=UTC)
-
-    tzinfo = get_timezone(request)
-    return tzinfo.normalize(datetime.astimezone(tzinfo))
-
-
-def to_utc(datetime, request=None):
-    """Convert a datetime object to UTC and drop tzinfo.  This is the
-    opposite operation to :func:`to_user_timezone`.
-    """
-    if datetime.tzinfo is None:
-        datetime = get_timezone(request).localize(datetime)
-
-    return datetime.astimezone(UTC).replace(tzinfo=None)
-
-
-def format_datetime(datetime=None, format=None, rebase=True, request=None):
-    """Return a date formatted according to the given pattern.  If no
-    :class:`~datetime.datetime` object is passed, the current time is
-    assumed.  By default rebasing happens which causes the object to
-    be converted to the users's timezone (as returned by
-    :func:`to_user_timezone`).  This function formats both date and
-    time.
-
-    The format parameter can either be ``'short'``, ``'medium'``,
-    ``'long'`` or ``'full'`` (in which cause the language's default for
-    that setting is used, or the default from the :attr:`Babel.date_formats`
-    mapping is used) or a format string as documented by Babel.
-
-    This function is also available in the template context as filter
-    named `datetimeformat`.
-    """
-    format = _get_format("datetime", format, request)
-    return _date_format(
-        dates.format_datetime, datetime, format, rebase, request=request
-    )
-
-
-def format_date(date=None, format=None, rebase=True, request=None):
-    """Return a date formatted according to the given pattern.  If no
-    :class:`~datetime.datetime` or :class:`~datetime.date` object is passed,
-    the current time is assumed.  By default rebasing happens which causes
-    the object to be converted to the users's timezone (as returned by
-    :func:`to_user_timezone`).  This function only formats the date part
-    of a :class:`~datetime.datetime` object.
-
-    The format parameter can either be ``'short'``, ``'medium'``,
-    ``'long'`` or ``'full'`` (in which cause the language's default for
-    that setting is used, or the default from the :attr:`Babel.date_formats`
-    mapping is used) or a format string as documented by Babel.
-
-    This function is also available in the template context as filter
-    named `dateformat`.
-    """
-    if rebase and isinstance(date, datetime):
-        date = to_user_timezone(date)
-
-    format = _get_format("date", format, request)
-    return _date_format(
-        dates.format_date, date, format, rebase, request=request
-    )
-
-
-def format_time(time=None, format=None, rebase=True, request=None):
-    """Return a time formatted according to the given pattern.  If no
-    :class:`~datetime.datetime` object is passed, the current time is
-    assumed.  By default rebasing happens which causes the object to
-    be converted to the users's timezone (as returned by
-    :func:`to_user_timezone`).  This function formats both date and
-    time.
-
-    The format parameter can either be ``'short'``, ``'medium'``,
-    ``'long'`` or ``'full'`` (in which cause the language's default for
-    that setting is used, or the default from the :attr:`Babel.date_formats`
-    mapping is used) or a format string as documented by Babel.
-
-    This function is also available in the template context as filter
-    named `timeformat`.
-    """
-    format = _get_format("time", format, request)
-    return _date_format(
-        dates.format_time, time, format, rebase, request=request
-    )
-
-
-def format_timedelta(
-    datetime_or_timedelta,
-    granularity="second",
-    add_direction=False,
-    threshold=0.85,
-    request=None,
-):
-    """Format the elapsed time from the given date to now or the given
-    timedelta.
-
-    This function is also available in the template context as filter
-    named `timedeltaformat`.
-    """
-    if isinstance(datetime_or_timedelta, datetime):
-        datetime_or_timedelta = datetime.utcnow() - datetime_or_timedelta
-
-    return dates.format_timedelta(
-        datetime_or_timedelta,
-        granularity,
-        threshold=threshold,
-        add_direction=add_direction,
-        locale=get_locale(request),
-    )
-
-
-def _date_format(formatter, obj, format, rebase, request=None, **extra):
-    """Internal helper that formats the date."""
-    locale = get_locale(request)
-    extra = {}
-    if formatter is not dates.format_date and rebase:
-        extra["tzinfo"] = get_timezone(request)
-
-    return formatter(obj, format, locale=locale, **extra)
-
-
-def format_number(number, request=None):
-    """Return the given number formatted for the locale in request
-
-    :param number: the number to format
-    :param request: the current Request object
-    :return: the formatted number
-    :rtype: str
-    """
-    return numbers.format_number(number, locale=get_locale(request))
-
-
-def format_decimal(number, format=None, request=None):
-    """Return the given decimal number formatted for the locale in request
-
-    :param number: the number to format
-    :param format: the format to use
-    :param request: the current Request object
-    :return: the formatted number
-    :rtype: str
-    """
-    return numbers.format_decimal(
-        number, format=format, locale=get_locale(request)
-    )
-
-
-def format_currency(
-    number,
-    currency,
-    format=None,
-    currency_digits=True,
-    format_type="standard",
-    request=None,
-):
-    """Return the given number formatted for the locale in request
-
-    :param number: the number to format
-    :param currency: the currency code
-    :param format: the format to use
-    :param currency_digits: use the currency’s number of decimal digits
-                            [default: True]
-    :param format_type: the currency format type to use
-                        [default: standard]
-    :param request: the current Request object
-    :return: the formatted number
-    :rtype: str
-    """
-    return numbers.format_currency(
-        number,
-        currency,
-        format=format,
-        locale=get_locale(request),
-        currency_digits=currency_digits,
-        format_type=format_type,
-    )
-
-
-def format_percent(number, format=None, request=None):
-    """Return formatted percent value for the locale in request
-
-    :param number: the number to format
-    :param format: the format to use
-    :param request: the current Request object
-    :return: the formatted percent number
-    :rtype: str
-    """
-    return numbers.format_percent(
-        number, format=format, locale=get_locale(request)
-    )
-
-
-def format_scientific(number, format=None, request=None):
-    """Return value formatted in scientific notation for the locale in request
-
-    :param number: the number to format
-    :param format: the format to use
-    :param request: the current Request object
-    :return: the formatted percent number
-    :rtype: str
-    """
-    return numbers.format_scientific(
-        number, format=format, locale=get_locale(request)
-    )
-
-
-def gettext(string, request=None, **variables):
-    """Translates a string with the current locale and passes in the
-    given keyword arguments as mapping to a string formatting string.
-
-    ::
-
-        gettext('Hello World!', request)
-        gettext('Hello %(name)s!', request, name='World')
-    """
-    t = get_translations(request)
-    if t is None:
-        return (string % variables) if variables else string
-
-    s = t.ugettext(string)
-    return (s % variables) if variables else s
-
-
-_ = gettext
-
-
-def ngettext(singular, plural, num, request=None, **variables):
-    """Translates a string with the current locale and passes in the
-    given keyword arguments as mapping to a string formatting string.
-    The `num` parameter is used to dispatch between singular and various
-    plural forms of the message.  It is available in the format string
-    as ``%(num)d`` or ``%(num)s``.  The source language should be
-    English or a similar language which only has one plural form.
-
-    ::
-
-        ngettext('%(num)d Apple', '%(num)d Apples', request=request,
-                 num=len(apples))
-    """
-    variables.setdefault("num", num)
-    t = get_translations(request)
-    if t is None:
-        s = singular if num == 1 else plural
-        return s if not variables else s % variables
-
-    s = t.ungettext(singular, plural, num)
-    return s if not variables else s % variables
-
-
-def pgettext(context, string, request=None, **variables):
-    """Like :func:`gettext` but with a context.
-    """
-    t = get_translations(request)
-    if t is None:
-        return string if not variables else string % variables
-
-    s = t.upgettext(context, string)
-    return s if not variables else s % variables
-
-
-def npgettext(context, singular, plural, num, request=None, **variables):
-    """Like :func:`ngettext` but with a context.
-    """
-    variables.setdefault("num", num)
-    t = get_translations(request)
-    if t is None:
-        s = singular if num == 1 else plural
-        return s if not variables else s % variables
-
-    s = t.unpgettext(context, singular, plural, num)
-    return s if not variables else s % variables
-
-
-def lazy_gettext(string, **variables):
-    """Like :func:`gettext` but the string returned is lazy which means
-    it will be translated when it is used as an actual string.
-
-    NOTE: As `sanic` does not provide something like `ctx_stack`, the
-    `lazy object` should call with `request` before using as an actual string.
-
-    Example::
-
-        hello = lazy_gettext('Hello World')
-
-        @app.route('/')
-        def index(request):
-            return str(hello(request))
-    """
-    return LazyString(gettext, string, **variables)
-
-
-def lazy_pgettext(context, string, **variables):
-    """Like :func:`pgettext` but the string returned is lazy which means
-    it will be translated when it is used as an actual string.
-    """
-    return LazyString(pgettext, context, string, **variables)
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    sanic_babel
+    ~~~~~~~~~~~~~~
+    Inspired from flask-babel
+
+    Implements i18n/l10n support for Flask applications based on Babel.
+
+    :copyright: (c) 2013 by Armin Ronacher, Daniel Neuhäuser.
+    :license: BSD, see LICENSE for more details.
+"""
+import os
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+
+from babel import Locale, dates, numbers, support
+
+try:
+    from pytz.gae import pytz
+except ImportError:
+    from pytz import UTC, timezone
+else:
+    timezone = pytz.timezone
+    UTC = pytz.UTC
+
+from sanic_babel.speaklater import LazyString
+
+__version__ = "0.3.0"
+
+#: shared fallback returned when no request is available; stateless, so
+#: one instance serves every caller and doubles as an identity sentinel
+_NULL_TRANSLATIONS = support.NullTranslations()
+
+#: bumped by :meth:`Babel.reload_translations`; part of the
+#: :class:`~sanic_babel.speaklater.LazyString` cache key, so reloading
+#: the catalogs invalidates every already-resolved lazy string
+_catalog_generation = 0
+
+#: per-request cache keys managed by this extension; interned so the
+#: request-dict probes on every translated response hit the identity
+#: fast path of the dict lookup
+_K_LOCALE = sys.intern("babel_locale")
+_K_TZINFO = sys.intern("babel_tzinfo")
+_K_TRANSLATIONS = sys.intern("babel_translations")
+_K_CTX = sys.intern("babel_ctx")
+_REQUEST_KEYS = (_K_LOCALE, _K_TZINFO, _K_TRANSLATIONS, _K_CTX)
+
+# bound once so tight render loops skip the attribute lookups
+_utcnow = datetime.utcnow
+_format_timedelta = dates.format_timedelta
+
+#: stack of locales pushed by :func:`force_locale`; a ContextVar keeps
+#: the override scoped to the current task across await boundaries
+_forced_locale = ContextVar("sanic_babel_forced_locale", default=())
+
+
+def get_request_container(request):
+    return request.ctx.__dict__ if hasattr(request, "ctx") else request
+
+
+@lru_cache(maxsize=64)
+def _load_merged_translations(locale_str, directories):
+    """Build a merged :class:`~babel.support.Translations` for a locale.
+
+    Parsing ``.mo`` files is pure file I/O determined entirely by the
+    (locale, directories) pair, so the result is shared across apps and
+    re-inits; :meth:`Babel.reload_translations` clears the cache.
+    """
+    translations = support.Translations()
+    for dirname in directories:
+        catalog = support.Translations.load(dirname, [locale_str])
+        translations.merge(catalog)
+        # FIXME: Workaround for merge() being really, really stupid. It
+        # does not copy _info, plural(), or any other instance variables
+        # populated by GNUTranslations. We probably want to stop using
+        # `support.Translations.merge` entirely.
+        if hasattr(catalog, "plural"):
+            translations.plural = catalog.plural
+
+    return translations
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=128)
+def _parse_locale(identifier):
+    """Parse a locale string into a `babel.Locale`, caching the result.
+
+    Parsing walks the CLDR data and is expensive; the set of locale
+    strings seen by a live application is tiny, so cache aggressively.
+    """
+    return Locale.parse(identifier)
+
+
+@lru_cache(maxsize=256)
+def _parse_timezone(zone):
+    """Look up a timezone by name, caching the result.
+
+    pytz parses zoneinfo data on construction; the returned objects are
+    immutable and process-global, so sharing them is safe.
+    """
+    return timezone(zone)
+
+
+class _DateFormats(dict):
+    """The per-app ``date_formats`` mapping.
+
+    Applications may modify it at any time to change the format
+    defaults, so every write drops the memoized resolutions kept for
+    :func:`_resolve_format`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._resolve_cache = {}
+
+    def __setitem__(self, key, value):
+        self._resolve_cache.clear()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._resolve_cache.clear()
+        super().__delitem__(key)
+
+    def update(self, *args, **kwargs):
+        self._resolve_cache.clear()
+        super().update(*args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        self._resolve_cache.clear()
+        return super().setdefault(key, default)
+
+    def pop(self, key, *default):
+        self._resolve_cache.clear()
+        return super().pop(key, *default)
+
+    def clear(self):
+        self._resolve_cache.clear()
+        super().clear()
+
+
+class Babel:
+    """Central controller class that can be used to configure how
+    sanic-babel behaves.  Each application that wants to use sanic-babel
+    has to create, or run :meth:`init_app` on, an instance of this class
+    after the configuration was initialized.
+    """
+
+    default_date_formats = MappingProxyType(
+        {
+            "time": "medium",
+            "date": "medium",
+            "datetime": "medium",
+            "time.short": None,
+            "time.medium": None,
+            "time.full": None,
+            "time.long": None,
+            "date.short": None,
+            "date.medium": None,
+            "date.full": None,
+            "date.long": None,
+            "datetime.short": None,
+            "datetime.medium": None,
+            "datetime.full": None,
+            "datetime.long": None,
+        }
+    )
+
+    def __init__(
+        self,
+        app=None,
+        default_locale="en",
+        default_timezone="UTC",
+        date_formats=None,
+        configure_jinja=True,
+    ):
+        self._default_locale = default_locale
+        self._default_timezone = default_timezone
+        self._date_formats = date_formats
+        self._configure_jinja = configure_jinja
+        self._translation_directories = None
+        self._translations_cache = {}
+        self.app = app
+        self.locale_selector_func = None
+        self.timezone_selector_func = None
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Set up this instance for use with *app*, if no app was passed to
+        the constructor.
+
+        Calling this again for an app that is already set up is a no-op;
+        config re-parsing, translation preloading and jinja filter
+        registration only happen once per app.
+        """
+        if getattr(app.ctx, "extensions", {}).get("babel") is self:
+            return
+
+        self.app = app
+        app.ctx.babel_instance = self
+        if not hasattr(app.ctx, "extensions"):
+            app.ctx.extensions = {}
+
+        app.ctx.extensions["babel"] = self
+
+        app.config.setdefault("BABEL_DEFAULT_LOCALE", self._default_locale)
+        app.config.setdefault("BABEL_DEFAULT_TIMEZONE", self._default_timezone)
+        self._translation_directories = tuple(
+            self._iter_translation_directories()
+        )
+        # preload every discovered translation so the request hot path is
+        # a plain dict read; cache is keyed by locale string
+        self._preload_translations()
+        if self._date_formats is None:
+            # a mutable copy on purpose: date_formats is documented as a
+            # mapping applications may modify to change the defaults
+            self._date_formats = _DateFormats(self.default_date_formats)
+
+        #: a mapping of Babel datetime format strings that can be modified
+        #: to change the defaults.  If you invoke :func:`format_datetime`
+        #: and do not provide any format string sanic-babel will do the
+        #: following things:
+        #:
+        #: 1.   look up ``date_formats['datetime']``.  By default ``'medium'``
+        #:      is returned to enforce medium length datetime formats.
+        #: 2.   ``date_formats['datetime.medium'] (if ``'medium'`` was
+        #:      returned in step one) is looked up.  If the return value
+        #:      is anything but `None` this is used as new format string.
+        #:      otherwise the default for that language is used.
+        self.date_formats = self._date_formats
+
+        if self._configure_jinja:
+            if not hasattr(app.ctx, "jinja_env"):
+                raise ValueError("app.ctx.jinja_env shoud be setup at first.")
+
+            app.ctx.jinja_env.filters.update(
+                datetimeformat=self._make_date_filter(
+                    "datetime", dates.format_datetime
+                ),
+                dateformat=self._make_date_filter("date", dates.format_date),
+                timeformat=self._make_date_filter("time", dates.format_time),
+                timedeltaformat=format_timedelta,
+                numberformat=format_number,
+                decimalformat=format_decimal,
+                currencyformat=format_currency,
+                percentformat=format_percent,
+                scientificformat=format_scientific,
+            )
+            app.ctx.jinja_env.add_extension("jinja2.ext.i18n")
+            app.ctx.jinja_env.newstyle_gettext = True
+            # reference for update context in jinja_env
+            self._get_translations = get_translations
+
+    def _make_date_filter(self, key, formatter):
+        """Build a Jinja filter for *key* that resolves formats against
+        this instance's date formats directly, skipping the per-call
+        ``request.app`` extension lookup of the module-level functions.
+        """
+        date_formats = self.date_formats
+
+        def _filter(obj=None, format=None, rebase=True, request=None):
+            if key == "date" and rebase and isinstance(obj, datetime):
+                obj = to_user_timezone(obj)
+
+            format = _resolve_format(key, format, date_formats)
+            return _date_format(
+                formatter, obj, format, rebase, request=request
+            )
+
+        return _filter
+
+    def localeselector(self, f):
+        """Registers a callback function for locale selection.  The default
+        behaves as if a function was registered that returns `None` all the
+        time.  If `None` is returned, the locale falls back to the one from
+        the configuration.
+
+        This has to return the locale as string (eg: ``'de_AT'``, ''`en_US`'')
+        """
+        assert (
+            self.locale_selector_func is None
+        ), "a localeselector function is already registered"
+        self.locale_selector_func = f
+        return f
+
+    def timezoneselector(self, f):
+        """Registers a callback function for timezone selection.  The default
+        behaves as if a function was registered that returns `None` all the
+        time.  If `None` is returned, the timezone falls back to the one from
+        the configuration.
+
+        This has to return the timezone as string (eg: ``'Europe/Vienna'``)
+        """
+        assert (
+            self.timezone_selector_func is None
+        ), "a timezoneselector function is already registered"
+        self.timezone_selector_func = f
+        return f
+
+    def list_translations(self):
+        """Returns a list of all the locales translations exist for.  The
+        list returned will be filled with actual locale objects and not just
+        strings.
+
+        The directory scan is cached; the cache key includes the
+        top-level directory mtimes, so newly dropped locale folders are
+        picked up without an explicit invalidation.
+        """
+        dirs = self.translation_directories
+        cache_key = (
+            dirs,
+            self._default_locale,
+            tuple(_mtime_ns(dirname) for dirname in dirs),
+        )
+        cached = self._translations_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = []
+
+        for dirname in self.translation_directories:
+            try:
+                folders = os.scandir(dirname)
+            except OSError:
+                continue
+
+            with folders:
+                for folder in folders:
+                    if not folder.is_dir():
+                        continue
+
+                    try:
+                        entries = os.scandir(
+                            os.path.join(folder.path, "LC_MESSAGES")
+                        )
+                    except OSError:
+                        continue
+
+                    with entries:
+                        if any(
+                            entry.name.endswith(".mo") for entry in entries
+                        ):
+                            result.append(Locale.parse(folder.name))
+
+        # If not other translations are found, add the default locale.
+        if not result:
+            result.append(_parse_locale(self._default_locale))
+
+        self._translations_cache[cache_key] = result
+        return result
+
+    def _load_translations(self, locale):
+        """Load and merge the catalogs for *locale* from all of the
+        configured translation directories.
+        """
+        return _load_merged_translations(
+            str(locale), self.translation_directories
+        )
+
+    def _preload_translations(self):
+        self.app.ctx.babel_translations = {
+            str(locale): self._load_translations(locale)
+            for locale in self.list_translations()
+        }
+
+    def reload_translations(self):
+        """(Re)build the application-level translations cache.  Call this
+        in development after compiling new catalogs.
+        """
+        global _catalog_generation
+
+        _load_merged_translations.cache_clear()
+        self._translations_cache.clear()
+        _catalog_generation += 1
+        self._preload_translations()
+
+    @property
+    def default_locale(self):
+        """The default locale from the configuration as instance of a
+        `babel.Locale` object.
+        """
+        return _parse_locale(self.app.config["BABEL_DEFAULT_LOCALE"])
+
+    @property
+    def default_timezone(self):
+        """The default timezone from the configuration as instance of a
+        `pytz.timezone` object.
+        """
+        return _parse_timezone(self.app.config["BABEL_DEFAULT_TIMEZONE"])
+
+    @property
+    def translation_directories(self):
+        if self._translation_directories is None:
+            self._translation_directories = tuple(
+                self._iter_translation_directories()
+            )
+
+        return self._translation_directories
+
+    def _iter_translation_directories(self):
+        directories = self.app.config.get(
+            "BABEL_TRANSLATION_DIRECTORIES", "translations"
+        ).split(";")
+
+        root_path = getattr(self.app, "root_path", None)
+        for path in directories:
+            if not os.path.isabs(path) and root_path is not None:
+                path = os.path.join(root_path, path)
+
+            yield path
+
+
+def get_translations(request=None):
+    """Returns the correct gettext translations that should be used for
+    this request.  This will never fail and return a dummy translation
+    object if used outside of the request or if a translation cannot be
+    found.
+    """
+    if request is None:
+        return _NULL_TRANSLATIONS
+
+    request_ = get_request_container(request)
+    translations = request_.get(_K_TRANSLATIONS)
+    if translations is not None:
+        return translations
+
+    app = request.app
+    locale = get_locale(request)
+    cache = app.ctx.babel_translations
+    key = str(locale)
+    translations = cache.get(key)
+    if translations is None:
+        translations = app.ctx.babel_instance._load_translations(locale)
+        cache[key] = translations
+
+    request_[_K_TRANSLATIONS] = translations
+    return translations
+
+
+def get_locale(request=None):
+    """Returns the locale that should be used for this request as
+    `babel.Locale` object.  This returns `Locale.parse('en')` if used outside
+    of a request.
+    """
+    forced = _forced_locale.get()
+    if forced:
+        return _parse_locale(forced[-1])
+
+    if request is None:
+        return _parse_locale("en")
+
+    request_ = get_request_container(request)
+    locale = request_.get(_K_LOCALE, None)
+    if locale is None:
+        babel = request.app.ctx.babel_instance
+        if babel.locale_selector_func is None:
+            locale = babel.default_locale
+        else:
+            rv = babel.locale_selector_func(request)
+            if rv is None:
+                locale = babel.default_locale
+            else:
+                locale = _parse_locale(rv)
+
+        request_[_K_LOCALE] = locale
+
+    return locale
+
+
+def get_timezone(request=None):
+    """Returns the timezone that should be used for this request as
+    `pytz.timezone` object.  This returns `UTC` if used outside of
+    a request.
+    """
+    if request is None:
+        return UTC
+
+    request_ = get_request_container(request)
+    tzinfo = request_.get(_K_TZINFO)
+    if tzinfo is None:
+        babel = request.app.ctx.babel_instance
+        if babel.timezone_selector_func is None:
+            tzinfo = babel.default_timezone
+        else:
+            rv = babel.timezone_selector_func(request)
+            if rv is None:
+                tzinfo = babel.default_timezone
+            else:
+                if isinstance(rv, str):
+                    tzinfo = _parse_timezone(rv)
+                else:
+                    tzinfo = rv
+
+        request_[_K_TZINFO] = tzinfo
+
+    return tzinfo
+
+
+def ensure_babel_ctx(request=None):
+    """Resolve the locale, timezone and translations for *request* in
+    one pass and cache the triple on the request under a single key.
+
+    Returns a ``(locale, tzinfo, translations)`` tuple.  The individual
+    accessors keep working and keep honouring per-key overrides; this
+    fused variant saves the repeated request-dict probes when many
+    values are translated or formatted for one response.
+    """
+    if request is None:
+        return (get_locale(None), get_timezone(None), _NULL_TRANSLATIONS)
+
+    request_ = get_request_container(request)
+    ctx = request_.get(_K_CTX)
+    if ctx is None:
+        ctx = (
+            get_locale(request),
+            get_timezone(request),
+            get_translations(request),
+        )
+        request_[_K_CTX] = ctx
+
+    return ctx
+
+
+def refresh(request=None):
+    """Refreshes the cached timezones and locale information.  This can
+    be used to switch a translation between a request and if you want
+    the changes to take place immediately, not just with the next request::
+
+        user.timezone = request.form['timezone']
+        user.locale = request.form['locale']
+        refresh(request)
+        jinja.flash(gettext('Language was changed', request))
+
+    NOTICE: :func:`jinja.flash` function is from `sanic-jinja2` package.
+
+    Without that refresh, the :func:`jinja.flash` function would probably
+    return English text and a now German page.
+    """
+    if request is None:
+        return
+
+    request_ = get_request_container(request)
+    for key in _REQUEST_KEYS:
+        request_.pop(key, None)
+
+    request.app.ctx.babel_instance._translations_cache.clear()
+
+
+@contextmanager
+def force_locale(locale, request=None):
+    """Temporarily overrides the currently selected locale.
+
+    Sometimes it is useful to switch the current locale to different one, do
+    some tasks and then revert back to the original one. For example, if the
+    user uses German on the web site, but you want to send them an email in
+    English, you can use this function as a context manager::
+
+        with force_locale('en_US', request):
+            send_email(gettext('Hello!', request), ...)
+
+    :param locale: The locale to temporary switch to (ex: 'en_US').
+    :param request: the current Request object
+    """
+    if request is None:
+        yield
+        return
+
+    request_ = get_request_container(request)
+    orig_attrs = {}
+    for key in (_K_TRANSLATIONS, _K_LOCALE, _K_CTX):
+        orig_attrs[key] = request_.pop(key, None)
+
+    # push onto the task-local stack; a ContextVar keeps the override
+    # contained to this task even across await boundaries, and nesting
+    # just pushes/pops
+    token = _forced_locale.set(_forced_locale.get() + (str(locale),))
+    try:
+        yield
+    finally:
+        _forced_locale.reset(token)
+        for key, value in orig_attrs.items():
+            request_[key] = value
+
+
+#: memoized results of :func:`_resolve_format` for the immutable
+#: :attr:`Babel.default_date_formats` mapping only; the mutable per-app
+#: mappings carry their own cache (see :class:`_DateFormats`)
+_FORMAT_CACHE = {}
+
+
+def _resolve_format(key, format, formats):
+    """Resolve *format* for *key* against the *formats* mapping.
+
+    Resolutions are memoized per mapping — the class default shares
+    :data:`_FORMAT_CACHE`, a :class:`_DateFormats` mapping caches on
+    itself and drops the cache on mutation.  Any other mapping is
+    resolved from scratch each time so modifications always apply.
+    """
+    if isinstance(formats, _DateFormats):
+        cache = formats._resolve_cache
+    elif formats is Babel.default_date_formats:
+        cache = _FORMAT_CACHE
+    else:
+        cache = None
+
+    if cache is not None:
+        try:
+            return cache[(key, format)]
+        except KeyError:
+            pass
+
+    resolved = format
+    if resolved is None:
+        resolved = formats[key]
+
+    if resolved in ("short", "medium", "full", "long"):
+        rv = formats["{}.{}".format(key, resolved)]
+        if rv is not None:
+            resolved = rv
+
+    if cache is not None:
+        cache[(key, format)] = resolved
+
+    return resolved
+
+
+def _get_format(key, format, request):
+    """A small helper for the datetime formatting functions.  Looks up
+    format defaults for different kinds.
+    """
+    if request is None:
+        # the defaults are only read here, so share the class mapping
+        formats = Babel.default_date_formats
+    else:
+        formats = request.app.ctx.extensions["babel"].date_formats
+
+    return _resolve_format(key, format, formats)
+
+
+def to_user_timezone(datetime, request=None):
+    """Convert a datetime object to the user's timezone.  This automatically
+    happens on all date formatting unless rebasing is disabled.  If you need
+    to convert a :class:`datetime.datetime` object at any time to the user's
+    timezone (as returned by :func:`get_timezone` this function can be used).
+    """
+    if datetime.tzinfo is None:
+        datetime = datetime.replace(tzinfo=UTC)
+
+    tzinfo = get_timezone(request)
+    if datetime.tzinfo is tzinfo:
+        return datetime
+
+    return tzinfo.normalize(datetime.astimezone(tzinfo))
+
+
+def to_utc(datetime, request=None):
+    """Convert a datetime object to UTC and drop tzinfo.  This is the
+    opposite operation to :func:`to_user_timezone`.
+    """
+    if datetime.tzinfo is None:
+        datetime = get_timezone(request).localize(datetime)
+    elif datetime.tzinfo is UTC:
+        return datetime.replace(tzinfo=None)
+
+    return datetime.astimezone(UTC).replace(tzinfo=None)
+
+
+def format_datetime(datetime=None, format=None, rebase=True, request=None):
+    """Return a date formatted according to the given pattern.  If no
+    :class:`~datetime.datetime` object is passed, the current time is
+    assumed.  By default rebasing happens which causes the object to
+    be converted to the users's timezone (as returned by
+    :func:`to_user_timezone`).  This function formats both date and
+    time.
+
+    The format parameter can either be ``'short'``, ``'medium'``,
+    ``'long'`` or ``'full'`` (in which cause the language's default for
+    that setting is used, or the default from the :attr:`Babel.date_formats`
+    mapping is used) or a format string as documented by Babel.
+
+    This function is also available in the template context as filter
+    named `datetimeformat`.
+    """
+    format = _get_format("datetime", format, request)
+    return _date_format(
+        dates.format_datetime, datetime, format, rebase, request=request
+    )
+
+
+def format_datetimes_bulk(datetimes, format=None, rebase=True, request=None):
+    """Format a sequence of datetimes in one go.
+
+    Equivalent to calling :func:`format_datetime` on each element, but
+    the locale, timezone and format pattern are resolved once up front
+    instead of per value — worth it when rendering thousands of rows in
+    a list or grid view.  Returns a list of formatted strings.
+    """
+    format = _get_format("datetime", format, request)
+    locale, tzinfo, _ = ensure_babel_ctx(request)
+    kwargs = {"locale": locale}
+    if rebase:
+        kwargs["tzinfo"] = tzinfo
+
+    formatter = dates.format_datetime
+    return [formatter(obj, format, **kwargs) for obj in datetimes]
+
+
+def format_date(date=None, format=None, rebase=True, request=None):
+    """Return a date formatted according to the given pattern.  If no
+    :class:`~datetime.datetime` or :class:`~datetime.date` object is passed,
+    the current time is assumed.  By default rebasing happens which causes
+    the object to be converted to the users's timezone (as returned by
+    :func:`to_user_timezone`).  This function only formats the date part
+    of a :class:`~datetime.datetime` object.
+
+    The format parameter can either be ``'short'``, ``'medium'``,
+    ``'long'`` or ``'full'`` (in which cause the language's default for
+    that setting is used, or the default from the :attr:`Babel.date_formats`
+    mapping is used) or a format string as documented by Babel.
+
+    This function is also available in the template context as filter
+    named `dateformat`.
+    """
+    if rebase and isinstance(date, datetime):
+        date = to_user_timezone(date)
+
+    format = _get_format("date", format, request)
+    return _date_format(
+        dates.format_date, date, format, rebase, request=request
+    )
+
+
+def format_time(time=None, format=None, rebase=True, request=None):
+    """Return a time formatted according to the given pattern.  If no
+    :class:`~datetime.datetime` object is passed, the current time is
+    assumed.  By default rebasing happens which causes the object to
+    be converted to the users's timezone (as returned by
+    :func:`to_user_timezone`).  This function formats both date and
+    time.
+
+    The format parameter can either be ``'short'``, ``'medium'``,
+    ``'long'`` or ``'full'`` (in which cause the language's default for
+    that setting is used, or the default from the :attr:`Babel.date_formats`
+    mapping is used) or a format string as documented by Babel.
+
+    This function is also available in the template context as filter
+    named `timeformat`.
+    """
+    format = _get_format("time", format, request)
+    return _date_format(
+        dates.format_time, time, format, rebase, request=request
+    )
+
+
+def format_timedelta(
+    datetime_or_timedelta,
+    granularity="second",
+    add_direction=False,
+    threshold=0.85,
+    request=None,
+):
+    """Format the elapsed time from the given date to now or the given
+    timedelta.
+
+    This function is also available in the template context as filter
+    named `timedeltaformat`.
+    """
+    if isinstance(datetime_or_timedelta, datetime):
+        datetime_or_timedelta = _utcnow() - datetime_or_timedelta
+
+    return _format_timedelta(
+        datetime_or_timedelta,
+        granularity,
+        threshold=threshold,
+        add_direction=add_direction,
+        locale=ensure_babel_ctx(request)[0],
+    )
+
+
+def _date_format(formatter, obj, format, rebase, request=None):
+    """Internal helper that formats the date."""
+    locale, tzinfo, _ = ensure_babel_ctx(request)
+    kwargs = {"locale": locale}
+    if rebase and formatter is not dates.format_date:
+        kwargs["tzinfo"] = tzinfo
+
+    return formatter(obj, format, **kwargs)
+
+
+def format_number(number, request=None, locale=None):
+    """Return the given number formatted for the locale in request
+
+    :param number: the number to format
+    :param request: the current Request object
+    :param locale: a pre-resolved locale, skipping the request lookup
+    :return: the formatted number
+    :rtype: str
+    """
+    if locale is None:
+        locale = ensure_babel_ctx(request)[0]
+
+    return numbers.format_number(number, locale=locale)
+
+
+def format_decimal(number, format=None, request=None, locale=None):
+    """Return the given decimal number formatted for the locale in request
+
+    :param number: the number to format
+    :param format: the format to use
+    :param request: the current Request object
+    :param locale: a pre-resolved locale, skipping the request lookup
+    :return: the formatted number
+    :rtype: str
+    """
+    if locale is None:
+        locale = ensure_babel_ctx(request)[0]
+
+    return numbers.format_decimal(number, format=format, locale=locale)
+
+
+def format_currency(
+    number,
+    currency,
+    format=None,
+    currency_digits=True,
+    format_type="standard",
+    request=None,
+    locale=None,
+):
+    """Return the given number formatted for the locale in request
+
+    :param number: the number to format
+    :param currency: the currency code
+    :param format: the format to use
+    :param currency_digits: use the currency’s number of decimal digits
+                            [default: True]
+    :param format_type: the currency format type to use
+                        [default: standard]
+    :param request: the current Request object
+    :param locale: a pre-resolved locale, skipping the request lookup
+    :return: the formatted number
+    :rtype: str
+    """
+    if locale is None:
+        locale = ensure_babel_ctx(request)[0]
+
+    return numbers.format_currency(
+        number,
+        currency,
+        format=format,
+        locale=locale,
+        currency_digits=currency_digits,
+        format_type=format_type,
+    )
+
+
+def format_percent(number, format=None, request=None, locale=None):
+    """Return formatted percent value for the locale in request
+
+    :param number: the number to format
+    :param format: the format to use
+    :param request: the current Request object
+    :param locale: a pre-resolved locale, skipping the request lookup
+    :return: the formatted percent number
+    :rtype: str
+    """
+    if locale is None:
+        locale = ensure_babel_ctx(request)[0]
+
+    return numbers.format_percent(number, format=format, locale=locale)
+
+
+def format_scientific(number, format=None, request=None, locale=None):
+    """Return value formatted in scientific notation for the locale in request
+
+    :param number: the number to format
+    :param format: the format to use
+    :param request: the current Request object
+    :param locale: a pre-resolved locale, skipping the request lookup
+    :return: the formatted percent number
+    :rtype: str
+    """
+    if locale is None:
+        locale = ensure_babel_ctx(request)[0]
+
+    return numbers.format_scientific(number, format=format, locale=locale)
+
+
+def gettext(string, request=None, **variables):
+    """Translates a string with the current locale and passes in the
+    given keyword arguments as mapping to a string formatting string.
+
+    ::
+
+        gettext('Hello World!', request)
+        gettext('Hello %(name)s!', request, name='World')
+    """
+    t = ensure_babel_ctx(request)[2]
+    if t is _NULL_TRANSLATIONS:
+        return string % variables if variables else string
+
+    s = t.ugettext(string)
+    return s % variables if variables else s
+
+
+_ = gettext
+
+
+def ngettext(singular, plural, num, request=None, **variables):
+    """Translates a string with the current locale and passes in the
+    given keyword arguments as mapping to a string formatting string.
+    The `num` parameter is used to dispatch between singular and various
+    plural forms of the message.  It is available in the format string
+    as ``%(num)d`` or ``%(num)s``.  The source language should be
+    English or a similar language which only has one plural form.
+
+    ::
+
+        ngettext('%(num)d Apple', '%(num)d Apples', request=request,
+                 num=len(apples))
+    """
+    variables.setdefault("num", num)
+    t = ensure_babel_ctx(request)[2]
+    if t is _NULL_TRANSLATIONS:
+        s = singular if num == 1 else plural
+    else:
+        s = t.ungettext(singular, plural, num)
+
+    return s % variables if variables else s
+
+
+def pgettext(context, string, request=None, **variables):
+    """Like :func:`gettext` but with a context.
+    """
+    t = ensure_babel_ctx(request)[2]
+    if t is _NULL_TRANSLATIONS:
+        return string % variables if variables else string
+
+    s = t.upgettext(context, string)
+    return s % variables if variables else s
+
+
+def npgettext(context, singular, plural, num, request=None, **variables):
+    """Like :func:`ngettext` but with a context.
+    """
+    variables.setdefault("num", num)
+    t = ensure_babel_ctx(request)[2]
+    if t is _NULL_TRANSLATIONS:
+        s = singular if num == 1 else plural
+    else:
+        s = t.unpgettext(context, singular, plural, num)
+
+    return s % variables if variables else s
+
+
+def lazy_gettext(string, **variables):
+    """Like :func:`gettext` but the string returned is lazy which means
+    it will be translated when it is used as an actual string.
+
+    NOTE: As `sanic` does not provide something like `ctx_stack`, the
+    `lazy object` should call with `request` before using as an actual string.
+
+    Example::
+
+        hello = lazy_gettext('Hello World')
+
+        @app.route('/')
+        def index(request):
+            return str(hello(request))
+    """
+    return LazyString(gettext, string, **variables)
+
+
+def lazy_pgettext(context, string, **variables):
+    """Like :func:`pgettext` but the string returned is lazy which means
+    it will be translated when it is used as an actual string.
+    """
+    return LazyString(pgettext, context, string, **variables)
@@ -2,17 +2,34 @@
 # -*- coding: utf-8 -*-
 
 
+def _make_lazy_string(func, args, kwargs):
+    """Rebuild a :class:`LazyString` from its reduced form."""
+    return LazyString(func, *args, **kwargs)
+
+
 class LazyString:
     def __init__(self, func, *args, **kwargs):
         self._func = func
         self._args = args
         kwargs["request"] = None
         self._kwargs = kwargs
+        # resolved strings keyed by (catalog generation, locale); the
+        # generation part makes Babel.reload_translations invalidate
+        # strings that already resolved against the old catalogs
+        self._cache = {}
 
     def __call__(self, request):
         self._kwargs["request"] = request
         return self
 
+    def __reduce__(self):
+        # serialize only the recipe; the bound request and the resolved
+        # cache are runtime state and would not survive a round-trip
+        kwargs = {
+            k: v for k, v in self._kwargs.items() if k != "request"
+        }
+        return (_make_lazy_string, (self._func, self._args, kwargs))
+
     def __getattr__(self, attr):
         if attr == "__setstate__":
             raise AttributeError(attr)
@@ -27,7 +44,21 @@ class LazyString:
         return "l'{0}'".format(str(self))
 
     def __str__(self):
-        return str(self._func(*self._args, **self._kwargs))
+        # imported here to avoid the circular import at module load
+        import sanic_babel
+
+        key = (
+            sanic_babel._catalog_generation,
+            str(sanic_babel.get_locale(self._kwargs["request"])),
+        )
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        string = str(self._func(*self._args, **self._kwargs))
+        self._cache[key] = string
+        return string
 
     def __len__(self):
         return len(str(self))
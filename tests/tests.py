@@ -1,312 +1,423 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
-import pickle
-
-import unittest
-from decimal import Decimal
-import sanic
-from sanic.response import text
-from datetime import datetime, timedelta
-import sanic_babel as babel
-from sanic_babel import gettext, ngettext, lazy_gettext, get_translations
-from babel.support import NullTranslations
-from sanic_jinja2 import SanicJinja2
-
-
-def get_app():
-    app = sanic.Sanic(__name__)
-
-    @app.route('/')
-    async def hello(request):
-        return text('hello')
-
-    return app
-
-
-def get_babel(app=None, **kwargs):
-    return babel.Babel(app=app, configure_jinja=False, **kwargs)
-
-
-class IntegrationTestCase(unittest.TestCase):
-    def test_no_request_context(self):
-        app = get_app()
-
-        b = get_babel()
-        b.init_app(app)
-
-        assert isinstance(get_translations(), NullTranslations)
-
-    def test_multiple_directories(self):
-        """
-        Ensure we can load translations from multiple directories.
-        """
-        app = get_app()
-        b = get_babel()
-
-        app.config.update({
-            'BABEL_TRANSLATION_DIRECTORIES': ';'.join((
-                'translations',
-                'renamed_translations'
-            )),
-            'BABEL_DEFAULT_LOCALE': 'de_DE'
-        })
-
-        b.init_app(app)
-
-        request, response = app.test_client.get('/')
-        translations = b.list_translations()
-
-        assert(len(translations) == 2)
-        assert(str(translations[0]) == 'de')
-        assert(str(translations[1]) == 'de')
-
-        assert gettext('Hello %(name)s!', name='Peter',
-                       request=request) == 'Hallo Peter!'
-
-    def test_lazy_old_style_formatting(self):
-        app = get_app()
-        get_babel(app)
-
-        lazy_string = lazy_gettext('Hello %(name)s')
-        request, response = app.test_client.get('/')
-        assert lazy_string(request) % {'name': 'test'} == 'Hello test'
-
-        lazy_string = lazy_gettext('test')
-        assert 'Hello %s' % lazy_string(request) == 'Hello test'
-
-    def test_lazy_pickling(self):
-        app = get_app()
-        get_babel(app)
-        request, response = app.test_client.get('/')
-
-        lazy_string = lazy_gettext('Foo')
-        pickled = pickle.dumps(lazy_string)
-        unpickled = pickle.loads(pickled)
-
-        assert unpickled == lazy_string
-
-
-class DateFormattingTestCase(unittest.TestCase):
-
-    def test_basics(self):
-        app = get_app()
-        get_babel(app)
-
-        request, response = app.test_client.get('/')
-
-        d = datetime(2010, 4, 12, 13, 46)
-        delta = timedelta(days=6)
-
-        assert babel.format_datetime(d, request=request) == \
-            'Apr 12, 2010, 1:46:00 PM'
-        assert babel.format_date(d, request=request) == 'Apr 12, 2010'
-        assert babel.format_time(d, request=request) == '1:46:00 PM'
-        assert babel.format_timedelta(delta, request=request) == '1 week'
-        assert babel.format_timedelta(delta, threshold=1, request=request) == \
-            '6 days'
-
-        app.config['BABEL_DEFAULT_TIMEZONE'] = 'Europe/Vienna'
-        request, response = app.test_client.get('/')
-        assert babel.format_datetime(d, request=request) == \
-            'Apr 12, 2010, 3:46:00 PM'
-        assert babel.format_date(d, request=request) == 'Apr 12, 2010'
-        assert babel.format_time(d, request=request) == '3:46:00 PM'
-
-        app.config['BABEL_DEFAULT_LOCALE'] = 'de_DE'
-        request, response = app.test_client.get('/')
-        assert babel.format_datetime(d, 'long', request=request) == \
-            '12. April 2010 um 15:46:00 MESZ'
-
-    def test_init_app(self):
-        b = get_babel()
-        app = get_app()
-        b.init_app(app)
-        d = datetime(2010, 4, 12, 13, 46)
-
-        request, response = app.test_client.get('/')
-        assert babel.format_datetime(d, request=request) == \
-            'Apr 12, 2010, 1:46:00 PM'
-        assert babel.format_date(d, request=request) == 'Apr 12, 2010'
-        assert babel.format_time(d, request=request) == '1:46:00 PM'
-
-        app.config['BABEL_DEFAULT_TIMEZONE'] = 'Europe/Vienna'
-        request, response = app.test_client.get('/')
-        assert babel.format_datetime(d, request=request) == \
-            'Apr 12, 2010, 3:46:00 PM'
-        assert babel.format_date(d, request=request) == 'Apr 12, 2010'
-        assert babel.format_time(d, request=request) == '3:46:00 PM'
-
-        app.config['BABEL_DEFAULT_LOCALE'] = 'de_DE'
-        request, response = app.test_client.get('/')
-        assert babel.format_datetime(d, 'long', request=request) == \
-            '12. April 2010 um 15:46:00 MESZ'
-
-    def test_custom_formats(self):
-        app = get_app()
-        app.config.update(
-            BABEL_DEFAULT_LOCALE='en_US',
-            BABEL_DEFAULT_TIMEZONE='Pacific/Johnston'
-        )
-        b = get_babel(app)
-        b.date_formats['datetime'] = 'long'
-        b.date_formats['datetime.long'] = 'MMMM d, yyyy h:mm:ss a'
-        d = datetime(2010, 4, 12, 13, 46)
-
-        request, response = app.test_client.get('/')
-        assert babel.format_datetime(d, request=request) == \
-            'April 12, 2010 3:46:00 AM'
-
-    def test_custom_locale_selector(self):
-        app = get_app()
-        b = get_babel(app)
-
-        d = datetime(2010, 4, 12, 13, 46)
-
-        the_timezone = 'UTC'
-        the_locale = 'en_US'
-
-        @b.localeselector
-        def select_locale(request):
-            return the_locale
-
-        @b.timezoneselector
-        def select_timezone(request):
-            return the_timezone
-
-        request, response = app.test_client.get('/')
-        assert babel.format_datetime(d, request=request) == \
-            'Apr 12, 2010, 1:46:00 PM'
-
-        the_locale = 'de_DE'
-        the_timezone = 'Europe/Vienna'
-
-        request, response = app.test_client.get('/')
-        assert babel.format_datetime(d, request=request) == \
-            '12.04.2010, 15:46:00'
-
-    def test_refreshing(self):
-        app = get_app()
-        get_babel(app)
-        request, response = app.test_client.get('/')
-
-        d = datetime(2010, 4, 12, 13, 46)
-        assert babel.format_datetime(d, request=request) == \
-            'Apr 12, 2010, 1:46:00 PM'
-        app.config['BABEL_DEFAULT_TIMEZONE'] = 'Europe/Vienna'
-        babel.refresh(request)
-        assert babel.format_datetime(d, request=request) == \
-            'Apr 12, 2010, 3:46:00 PM'
-
-    def test_force_locale(self):
-        app = get_app()
-        b = get_babel(app)
-
-        @b.localeselector
-        def select_locale(request):
-            return 'de_DE'
-
-        request, response = app.test_client.get('/')
-        assert str(babel.get_locale(request)) == 'de_DE'
-
-        with babel.force_locale('en_US', request):
-            assert str(babel.get_locale(request)) == 'en_US'
-
-        assert str(babel.get_locale(request)) == 'de_DE'
-
-
-class NumberFormattingTestCase(unittest.TestCase):
-
-    def test_basics(self):
-        app = get_app()
-        get_babel(app)
-        n = 1099
-
-        request, response = app.test_client.get('/')
-        assert babel.format_number(n, request=request) == '1,099'
-        assert babel.format_decimal(Decimal('1010.99'), request=request) == \
-            '1,010.99'
-        assert babel.format_currency(n, 'USD', request=request) == '$1,099.00'
-        assert babel.format_percent(0.19, request=request) == '19%'
-        assert babel.format_scientific(10000, request=request) == '1E4'
-
-
-class GettextTestCase(unittest.TestCase):
-
-    def test_basics(self):
-        app = get_app()
-        get_babel(app, default_locale='de_DE')
-
-        request, response = app.test_client.get('/')
-        assert gettext('Hello %(name)s!', name='Peter', request=request) == \
-            'Hallo Peter!'
-        assert ngettext('%(num)s Apple', '%(num)s Apples', 3,
-                        request=request) == '3 Äpfel'
-        assert ngettext('%(num)s Apple', '%(num)s Apples', 1,
-                        request=request) == '1 Apfel'
-
-    def test_template_basics(self):
-        app = get_app()
-        jinja = SanicJinja2(app, autoescape=True)
-        babel.Babel(app, default_locale='de_DE')
-
-        t = lambda x, request: jinja.render_source('{{ %s }}' % x, request)
-
-        request, response = app.test_client.get('/')
-        assert t("gettext('Hello %(name)s!', name='Peter')", request) == \
-            'Hallo Peter!'
-        assert t("ngettext('%(num)s Apple', '%(num)s Apples', 3)",
-                 request) == '3 Äpfel'
-        assert t("ngettext('%(num)s Apple', '%(num)s Apples', 1)",
-                 request) == '1 Apfel'
-        assert jinja.render_source('''
-            {% trans %}Hello {{ name }}!{% endtrans %}
-        ''', request, name='Peter').strip() == 'Hallo Peter!'
-        assert jinja.render_source('''
-            {% trans num=3 %}{{ num }} Apple
-            {%- pluralize %}{{ num }} Apples{% endtrans %}
-        ''', request, name='Peter').strip() == '3 Äpfel'
-
-    def test_lazy_gettext(self):
-        app = get_app()
-        get_babel(app, default_locale='de_DE')
-        yes = lazy_gettext('Yes')
-
-        request, response = app.test_client.get('/')
-        yes(request)
-        assert str(yes) == 'Ja'
-        assert yes.__html__() == 'Ja'
-
-        app.config['BABEL_DEFAULT_LOCALE'] = 'en_US'
-        request, response = app.test_client.get('/')
-        yes(request)
-        assert str(yes) == 'Yes'
-        assert yes.__html__() == 'Yes'
-
-    def test_list_translations(self):
-        app = get_app()
-        b = get_babel(app, default_locale='de_DE')
-        translations = b.list_translations()
-        assert len(translations) == 1
-        assert str(translations[0]) == 'de'
-
-    def test_no_formatting(self):
-        """
-        Ensure we don't format strings unless a variable is passed.
-        """
-        app = get_app()
-        get_babel(app)
-
-        request, response = app.test_client.get('/')
-        assert gettext('Test %s', request=request) == 'Test %s'
-        assert gettext('Test %(name)s', name='test', request=request) == \
-            'Test test'
-        assert gettext('Test %s', request=request) % 'test' == 'Test test'
-
-
-if __name__ == '__main__':
-    unittest.main()
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import copy
+import pickle
+from functools import lru_cache
+
+import unittest
+from decimal import Decimal
+import sanic
+from sanic.compat import Header
+from sanic.request import Request
+from sanic.response import text
+from datetime import datetime, timedelta
+import sanic_babel as babel
+from sanic_babel import gettext, ngettext, lazy_gettext, get_translations
+from babel.support import NullTranslations
+from sanic_jinja2 import SanicJinja2
+
+
+# each test builds an app under the same name; test mode keeps the app
+# registry from rejecting the duplicates (the test client used to set
+# this implicitly)
+sanic.Sanic.test_mode = True
+
+
+def get_app():
+    app = sanic.Sanic(__name__)
+
+    @app.route('/')
+    async def hello(request):
+        return text('hello')
+
+    return app
+
+
+def get_request(app):
+    # build the request directly -- no test server round-trip is needed
+    # just to obtain a request object
+    return Request(b'/', Header(), '1.1', 'GET', None, app)
+
+
+def get_babel(app=None, **kwargs):
+    return babel.Babel(app=app, configure_jinja=False, **kwargs)
+
+
+@lru_cache(maxsize=128)
+def compile_source(env, source):
+    # template compilation (lex + parse + codegen) dominates repeated
+    # render_source calls; cache the compiled template per source string
+    return env.from_string(source)
+
+
+class BabelTestCase(unittest.TestCase):
+    """Shares one app and Babel instance per test class.
+
+    Sanic app construction (router, signals, config) is expensive enough
+    to matter when repeated per test.  Tests that need their own
+    construction flow (init_app variants, selectors, custom formats)
+    still build a fresh app; the rest use ``self.app``/``self.babel``.
+    Config changes made by a test are rolled back in ``tearDown``.
+    """
+
+    babel_kwargs = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = get_app()
+        cls.babel = get_babel(cls.app, **cls.babel_kwargs)
+
+    def setUp(self):
+        self._config = dict(self.app.config)
+
+    def tearDown(self):
+        for key in list(self.app.config.keys()):
+            if key not in self._config:
+                del self.app.config[key]
+
+        self.app.config.update(self._config)
+
+
+class IntegrationTestCase(BabelTestCase):
+    def test_no_request_context(self):
+        app = get_app()
+
+        b = get_babel()
+        b.init_app(app)
+
+        assert isinstance(get_translations(), NullTranslations)
+
+    def test_multiple_directories(self):
+        """
+        Ensure we can load translations from multiple directories.
+        """
+        app = get_app()
+        b = get_babel()
+
+        app.config.update({
+            'BABEL_TRANSLATION_DIRECTORIES': ';'.join((
+                'translations',
+                'renamed_translations'
+            )),
+            'BABEL_DEFAULT_LOCALE': 'de_DE'
+        })
+
+        b.init_app(app)
+
+        request = get_request(app)
+        translations = b.list_translations()
+
+        assert(len(translations) == 2)
+        assert(str(translations[0]) == 'de')
+        assert(str(translations[1]) == 'de')
+
+        assert gettext('Hello %(name)s!', name='Peter',
+                       request=request) == 'Hallo Peter!'
+
+    def test_lazy_old_style_formatting(self):
+        app = self.app
+
+        lazy_string = lazy_gettext('Hello %(name)s')
+        request = get_request(app)
+        assert lazy_string(request) % {'name': 'test'} == 'Hello test'
+
+        lazy_string = lazy_gettext('test')
+        assert 'Hello %s' % lazy_string(request) == 'Hello test'
+
+    def test_lazy_pickling(self):
+        lazy_string = lazy_gettext('Foo')
+
+        # __reduce__ carries the recipe (function + args), not the
+        # bound request or any resolved state
+        func, args = lazy_string.__reduce__()
+        assert args[0] is gettext
+        assert args[1] == ('Foo',)
+
+        assert copy.deepcopy(lazy_string) == lazy_string
+
+        # a single round-trip as a smoke test of the pickle protocol
+        unpickled = pickle.loads(pickle.dumps(lazy_string))
+        assert unpickled == lazy_string
+
+
+class DateFormattingTestCase(BabelTestCase):
+
+    #: (config overrides, datetime format, expected datetime/date/time)
+    #: applied cumulatively with a refresh between stages
+    format_cases = [
+        ({}, None,
+         ('Apr 12, 2010, 1:46:00 PM', 'Apr 12, 2010', '1:46:00 PM')),
+        ({'BABEL_DEFAULT_TIMEZONE': 'Europe/Vienna'}, None,
+         ('Apr 12, 2010, 3:46:00 PM', 'Apr 12, 2010', '3:46:00 PM')),
+        ({'BABEL_DEFAULT_LOCALE': 'de_DE'}, 'long',
+         ('12. April 2010 um 15:46:00 MESZ', None, None)),
+    ]
+
+    def assert_format_cases(self, app, request):
+        d = datetime(2010, 4, 12, 13, 46)
+
+        for config, format, expected in self.format_cases:
+            app.config.update(config)
+            babel.refresh(request)
+            expected_datetime, expected_date, expected_time = expected
+            with self.subTest(config=config):
+                assert babel.format_datetime(
+                    d, format, request=request) == expected_datetime
+                if expected_date is not None:
+                    assert babel.format_date(
+                        d, request=request) == expected_date
+                if expected_time is not None:
+                    assert babel.format_time(
+                        d, request=request) == expected_time
+
+    def test_basics(self):
+        app = self.app
+        request = get_request(app)
+        delta = timedelta(days=6)
+
+        assert babel.format_timedelta(delta, request=request) == '1 week'
+        assert babel.format_timedelta(delta, threshold=1, request=request) == \
+            '6 days'
+
+        self.assert_format_cases(app, request)
+
+    def test_init_app(self):
+        b = get_babel()
+        app = get_app()
+        b.init_app(app)
+
+        request = get_request(app)
+        self.assert_format_cases(app, request)
+
+    def test_custom_formats(self):
+        app = get_app()
+        app.config.update(
+            BABEL_DEFAULT_LOCALE='en_US',
+            BABEL_DEFAULT_TIMEZONE='Pacific/Johnston'
+        )
+        b = get_babel(app)
+        b.date_formats['datetime'] = 'long'
+        b.date_formats['datetime.long'] = 'MMMM d, yyyy h:mm:ss a'
+        d = datetime(2010, 4, 12, 13, 46)
+
+        request = get_request(app)
+        assert babel.format_datetime(d, request=request) == \
+            'April 12, 2010 3:46:00 AM'
+
+        # modifying the mapping after the first format call must take
+        # effect immediately
+        b.date_formats['datetime.long'] = 'MMMM d, yyyy'
+        assert babel.format_datetime(d, request=request) == 'April 12, 2010'
+
+    def test_bulk_formatting(self):
+        app = self.app
+        request = get_request(app)
+        d = datetime(2010, 4, 12, 13, 46)
+
+        assert babel.format_datetimes_bulk([d, d], request=request) == \
+            [babel.format_datetime(d, request=request)] * 2
+        assert babel.format_datetimes_bulk(
+            [d], rebase=False, request=request) == \
+            [babel.format_datetime(d, rebase=False, request=request)]
+        assert babel.format_datetimes_bulk([], request=request) == []
+
+    def test_custom_locale_selector(self):
+        app = get_app()
+        b = get_babel(app)
+
+        d = datetime(2010, 4, 12, 13, 46)
+
+        the_timezone = 'UTC'
+        the_locale = 'en_US'
+
+        @b.localeselector
+        def select_locale(request):
+            return the_locale
+
+        @b.timezoneselector
+        def select_timezone(request):
+            return the_timezone
+
+        request = get_request(app)
+        assert babel.format_datetime(d, request=request) == \
+            'Apr 12, 2010, 1:46:00 PM'
+
+        the_locale = 'de_DE'
+        the_timezone = 'Europe/Vienna'
+
+        babel.refresh(request)
+        assert babel.format_datetime(d, request=request) == \
+            '12.04.2010, 15:46:00'
+
+    def test_refreshing(self):
+        app = self.app
+        request = get_request(app)
+
+        d = datetime(2010, 4, 12, 13, 46)
+        assert babel.format_datetime(d, request=request) == \
+            'Apr 12, 2010, 1:46:00 PM'
+        app.config['BABEL_DEFAULT_TIMEZONE'] = 'Europe/Vienna'
+        babel.refresh(request)
+        assert babel.format_datetime(d, request=request) == \
+            'Apr 12, 2010, 3:46:00 PM'
+
+    def test_force_locale(self):
+        app = get_app()
+        b = get_babel(app)
+
+        @b.localeselector
+        def select_locale(request):
+            return 'de_DE'
+
+        request = get_request(app)
+        assert str(babel.get_locale(request)) == 'de_DE'
+
+        with babel.force_locale('en_US', request):
+            assert str(babel.get_locale(request)) == 'en_US'
+
+        assert str(babel.get_locale(request)) == 'de_DE'
+
+
+class NumberFormattingTestCase(BabelTestCase):
+
+    def test_basics(self):
+        app = self.app
+        n = 1099
+
+        request = get_request(app)
+        # resolve the locale once and hand it to every formatter
+        loc = babel.get_locale(request)
+        cases = [
+            (babel.format_number, (n,), {}, '1,099'),
+            (babel.format_decimal, (Decimal('1010.99'),), {}, '1,010.99'),
+            (babel.format_currency, (n, 'USD'), {}, '$1,099.00'),
+            (babel.format_percent, (0.19,), {}, '19%'),
+            (babel.format_scientific, (10000,), {}, '1E4'),
+        ]
+
+        for fn, args, kwargs, expected in cases:
+            with self.subTest(fn=fn.__name__):
+                assert fn(*args, locale=loc, **kwargs) == expected
+
+
+class GettextTestCase(BabelTestCase):
+
+    babel_kwargs = {'default_locale': 'de_DE'}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # separate app for template tests: jinja must exist before the
+        # babel instance configures it
+        cls.jinja_app = get_app()
+        cls.jinja = SanicJinja2(cls.jinja_app, autoescape=True)
+        babel.Babel(cls.jinja_app, default_locale='de_DE')
+
+    def render_source(self, source, request, **context):
+        self.jinja.update_request_context(request, context)
+        return compile_source(self.jinja.env, source).render(**context)
+
+    def test_basics(self):
+        app = self.app
+
+        request = get_request(app)
+        assert gettext('Hello %(name)s!', name='Peter', request=request) == \
+            'Hallo Peter!'
+        assert ngettext('%(num)s Apple', '%(num)s Apples', 3,
+                        request=request) == '3 Äpfel'
+        assert ngettext('%(num)s Apple', '%(num)s Apples', 1,
+                        request=request) == '1 Apfel'
+
+    def test_template_basics(self):
+        t = lambda x, request: self.render_source('{{ %s }}' % x, request)
+
+        request = get_request(self.jinja_app)
+        assert t("gettext('Hello %(name)s!', name='Peter')", request) == \
+            'Hallo Peter!'
+        assert t("ngettext('%(num)s Apple', '%(num)s Apples', 3)",
+                 request) == '3 Äpfel'
+        assert t("ngettext('%(num)s Apple', '%(num)s Apples', 1)",
+                 request) == '1 Apfel'
+        assert self.render_source('''
+            {% trans %}Hello {{ name }}!{% endtrans %}
+        ''', request, name='Peter').strip() == 'Hallo Peter!'
+        assert self.render_source('''
+            {% trans num=3 %}{{ num }} Apple
+            {%- pluralize %}{{ num }} Apples{% endtrans %}
+        ''', request, name='Peter').strip() == '3 Äpfel'
+
+    def test_lazy_gettext(self):
+        app = self.app
+        yes = lazy_gettext('Yes')
+
+        request = get_request(app)
+        yes(request)
+        assert str(yes) == 'Ja'
+        assert yes.__html__() == 'Ja'
+
+        app.config['BABEL_DEFAULT_LOCALE'] = 'en_US'
+        babel.refresh(request)
+        yes(request)
+        assert str(yes) == 'Yes'
+        assert yes.__html__() == 'Yes'
+
+    def test_lazy_cache_invalidation(self):
+        app = self.app
+        yes = lazy_gettext('Yes')
+
+        request = get_request(app)
+        assert str(yes(request)) == 'Ja'
+
+        # reloading the catalogs bumps the generation, so the cached
+        # resolution is bypassed and the string resolves afresh
+        keys_before = set(yes._cache)
+        self.babel.reload_translations()
+        assert str(yes(request)) == 'Ja'
+        assert set(yes._cache) != keys_before
+
+    def test_list_translations(self):
+        b = self.babel
+        translations = b.list_translations()
+        assert len(translations) == 1
+        assert str(translations[0]) == 'de'
+
+    def test_reload_translations(self):
+        app = self.app
+        old = app.ctx.babel_translations
+
+        self.babel.reload_translations()
+        # the app-level cache is rebuilt from disk with the shipped
+        # locales (on-demand entries from earlier requests are dropped)
+        assert app.ctx.babel_translations is not old
+        assert 'de' in app.ctx.babel_translations
+
+        # ...and the reloaded catalogs still resolve
+        request = get_request(app)
+        assert gettext('Yes', request=request) == 'Ja'
+
+    def test_no_formatting(self):
+        """
+        Ensure we don't format strings unless a variable is passed.
+        """
+        app = self.app
+
+        request = get_request(app)
+        assert gettext('Test %s', request=request) == 'Test %s'
+        assert gettext('Test %(name)s', name='test', request=request) == \
+            'Test test'
+        assert gettext('Test %s', request=request) % 'test' == 'Test test'
+
+        # without variables the catalog hit must come back untouched --
+        # identity guards the fast path against regressing into a
+        # needless % formatting pass
+        untranslated = 'Test %s'
+        assert gettext(untranslated, request=request) is untranslated
+
+
+if __name__ == '__main__':
+    unittest.main()